@@ -0,0 +1,13 @@
+import re
+
+# Client log formats, shared by the memcached result parsers.
+
+# SET put 387807 avg 77712 p90 86722 p95 89712 p99 231960
+# UPDATE put 365130 avg 84194 p90 91366 p95 94937 p99 243115
+# GET put 373528 avg 85134 p90 90945 p95 94510 p99 255360
+# Groups: kind, throughput, avg, p90, p95, p99.
+pat_task = re.compile(r"(SET|UPDATE|GET) put (\d+) avg (\d+) p90 (\d+) p95 (\d+) p99 (\d+)")
+
+# client setting ngroups=3, nclients=32, nsets=50331648, ngets=524288, rps=0
+# key=value settings on the "client setting" line, comma and/or space separated.
+pat_cfg = re.compile(r"([^\s=,]+)=([^\s,]+)")
@@ -386,6 +386,14 @@ def main() -> int:
             "results/memcached-config.<tag>.txt config log."
         ),
     )
+    parser.add_argument(
+        "--emit-stdout",
+        action="store_true",
+        help=(
+            "Also print the throughput JSON as a single line on stdout "
+            "(used by the sweep drivers to avoid re-reading the sidecar)."
+        ),
+    )
     parser.add_argument("--pin", action=argparse.BooleanOptionalAction, default=True)
     parser.add_argument(
         "--mode",
@@ -1031,6 +1039,8 @@ def main() -> int:
             json.dumps(out, ensure_ascii=False, indent=2) + "\n", encoding="utf8"
         )
         print(f"Wrote {out_txt}", file=sys.stderr)
+        if args.emit_stdout:
+            print(json.dumps(out, ensure_ascii=False, separators=(",", ":")), flush=True)
 
     def run_memory() -> None:
         def move_if_exists(src: Path, dst: Path) -> None:
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import gzip
 import json
 import math
+import operator
+import os
 import platform
+import re
 import subprocess
 import sys
 import time
-from dataclasses import dataclass
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, is_dataclass
+from functools import lru_cache
 from pathlib import Path
 from statistics import median
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
@@ -15,6 +22,8 @@ from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 SEI_VARIANT_CHOICES = ["er2", "er5", "er10", "dynamicNway", "core", "dynamicCore"]
 SEI_VARIANT_ALIASES = {"default": "er2"}
 
+_LIST_SPLIT = re.compile(r"\s*,\s*")
+
 
 def _normalize_sei_variant(variant: str) -> str:
     v = variant.strip()
@@ -38,25 +47,19 @@ def _parse_sei_variants(s: str) -> List[str]:
     return out
 
 
+def _split_list(s: str) -> List[str]:
+    return [p for p in _LIST_SPLIT.split(s.strip()) if p]
+
+
 def _parse_int_list(s: str) -> List[int]:
-    xs: List[int] = []
-    for part in s.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        xs.append(int(part))
+    xs = [int(p) for p in _split_list(s)]
     if not xs:
         raise ValueError("empty list")
     return xs
 
 
 def _parse_str_list(s: str) -> List[str]:
-    xs: List[str] = []
-    for part in s.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        xs.append(part)
+    xs = _split_list(s)
     if not xs:
         raise ValueError("empty list")
     return xs
@@ -68,19 +71,71 @@ def _median(values: Sequence[float]) -> float:
     return float(median(values))
 
 
-def _git_sha(repo: Path) -> str:
+def _json_default(obj: object) -> object:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json(obj: object) -> bytes:
+    # Dataclass instances (RunResult) are converted by _json_default.
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default).encode("utf8")
+
+
+def _write_json_streamed(out: Path, obj: Dict[str, object], *, stream_key: str) -> None:
+    # Produces the same bytes as _dumps_json(obj) + newline, but encodes the
+    # list under stream_key one element at a time so that only one run (plus
+    # the write buffer) is held in memory.
+    with open(out, "wb", buffering=1 << 20) as f:
+        f.write(b"{")
+        for i, (key, value) in enumerate(obj.items()):
+            f.write(b",\n  " if i else b"\n  ")
+            f.write(_dumps_json(key) + b": ")
+            if key == stream_key and value:
+                f.write(b"[")
+                for j, item in enumerate(value):
+                    f.write(b",\n    " if j else b"\n    ")
+                    f.write(_dumps_json(item).replace(b"\n", b"\n    "))
+                f.write(b"\n  ]")
+            else:
+                f.write(_dumps_json(value).replace(b"\n", b"\n  "))
+        f.write(b"\n}\n" if obj else b"}\n")
+
+
+@lru_cache(maxsize=None)
+def _git_sha(repo: str) -> str:
     try:
         res = subprocess.run(
-            ["git", "-C", str(repo), "rev-parse", "HEAD"],
+            ["git", "-C", repo, "rev-parse", "HEAD"],
             check=True,
             capture_output=True,
             text=True,
+            env={**os.environ, "GIT_OPTIONAL_LOCKS": "0"},
         )
         return res.stdout.strip()
     except Exception:
         return "unknown"
 
 
+def _run_streamed(cmd: Sequence[str], cwd: Path) -> None:
+    # Tee the child's combined output to our stderr line by line so that
+    # long-running cells stay visible alongside the [done/total] progress.
+    with subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            sys.stderr.write(line)
+        rc = proc.wait()
+    if rc:
+        raise subprocess.CalledProcessError(rc, list(cmd))
+
+
 def _sanitize_tag(tag: str) -> str:
     if "/" in tag or "\\" in tag:
         raise ValueError("tag must not contain path separators")
@@ -91,6 +146,14 @@ def _sanitize_tag(tag: str) -> str:
     return tag
 
 
+def _validate_tag_suffix(suffix: str) -> str:
+    # For suffixes appended to an already-sanitized prefix: only the
+    # appended part needs the path-separator check.
+    if "/" in suffix or "\\" in suffix:
+        raise ValueError("tag must not contain path separators")
+    return suffix
+
+
 def _format_si(n: float) -> str:
     if n >= 1_000_000:
         return f"{n/1_000_000:.2f}M"
@@ -99,22 +162,33 @@ def _format_si(n: float) -> str:
     return f"{n:.0f}"
 
 
+_NICE_BOUNDS = (1, 2, 5)
+_NICE_MULTIPLIERS = (1, 2, 5, 10)
+_DECIMAL_EXPONENT_MAX_DEPTH = 12
+
+
 def _nice_step(span: float, ticks: int) -> float:
     if span <= 0 or ticks <= 0:
         return 1.0
     raw = span / ticks
-    exp = math.floor(math.log10(raw)) if raw > 0 else 0
+    exp = _decimal_exponent(raw)
     base = 10**exp
     frac = raw / base
-    if frac <= 1:
-        nice = 1
-    elif frac <= 2:
-        nice = 2
-    elif frac <= 5:
-        nice = 5
-    else:
-        nice = 10
-    return nice * base
+    return _NICE_MULTIPLIERS[bisect_left(_NICE_BOUNDS, frac)] * base
+
+
+def _decimal_exponent(x: float) -> int:
+    # floor(log10(x)) without a libm call in the common cases.
+    if x >= 1.0:
+        return len(repr(int(x))) - 1
+    v = x
+    exp = 0
+    while 0.0 < v < 1.0 and exp > -_DECIMAL_EXPONENT_MAX_DEPTH:
+        v *= 10.0
+        exp -= 1
+    if v >= 1.0:
+        return exp
+    return math.floor(math.log10(x)) if x > 0 else 0
 
 
 def _svg_escape(text: str) -> str:
@@ -135,6 +209,7 @@ def _write_svg_line_chart(
     series: Dict[str, List[Optional[float]]],
     x_label: str,
     y_label: str = "Throughput (ops/s)",
+    svgz: bool = False,
 ) -> None:
     width = 1100
     height = 650
@@ -253,9 +328,14 @@ def _write_svg_line_chart(
             lines.append(
                 f'<polyline fill="none" stroke="{colors[name]}" stroke-width="2.4" points="{poly}"/>'
             )
-        for x, y in pts:
+        if pts:
+            # All markers of a series as one <path> of two-arc circles (r=4)
+            # instead of one <circle> element per point.
+            markers = "".join(
+                f"M{x - 4.0:.1f},{y:.1f}a4,4 0 1,0 8,0a4,4 0 1,0 -8,0Z" for x, y in pts
+            )
             lines.append(
-                f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4.0" fill="{colors[name]}" stroke="#fff" stroke-width="1"/>'
+                f'<path d="{markers}" fill="{colors[name]}" stroke="#fff" stroke-width="1"/>'
             )
 
     legend_x0 = plot_x0 + plot_w + 20
@@ -273,7 +353,12 @@ def _write_svg_line_chart(
         )
 
     lines.append("</svg>")
-    out.write_text("\n".join(lines) + "\n", encoding="utf8")
+    text = "\n".join(lines) + "\n"
+    if svgz:
+        with gzip.open(out, "wb", compresslevel=6) as f:
+            f.write(text.encode("utf8"))
+    else:
+        out.write_text(text, encoding="utf8")
 
 
 @dataclass(frozen=True)
@@ -385,6 +470,11 @@ def main() -> int:
         action="store_true",
         help="Print commands without executing.",
     )
+    parser.add_argument(
+        "--svgz",
+        action="store_true",
+        help="Write the plot as gzip-compressed SVG (.svgz) instead of plain SVG.",
+    )
     args = parser.parse_args()
 
     if args.nclients <= 0:
@@ -451,6 +541,35 @@ def main() -> int:
             out[v] = float(v_obj["throughput"])
         return out
 
+    root_prefix = str(root) + os.sep
+
+    def _rel_to_root(p: Path) -> str:
+        # Every per-run JSON lives under results_dir, so a string prefix strip
+        # avoids a component-wise Path.relative_to walk per cell.
+        s = str(p)
+        if s.startswith(root_prefix):
+            return s[len(root_prefix):]
+        return str(p.relative_to(root))
+
+    def _run_result_from_data(
+        *, data: dict, rps_pt: int, repeat: int, tag: str, out_json: Path
+    ) -> RunResult:
+        sei_tp = _extract_sei_throughputs(data)
+        return RunResult(
+            rps_per_thread=rps_pt,
+            repeat=repeat,
+            tag=tag,
+            throughput_json=_rel_to_root(out_json),
+            vanilla=float(data["vanilla"]["throughput"]),
+            sei=sei_tp,
+            orthrus=float(data["orthrus"]["throughput"]),
+            orthrus_sync=(
+                float(data["orthrus_sync"]["throughput"]) if "orthrus_sync" in data else None
+            ),
+            rbv=float(data["rbv"]["throughput"]),
+            rbv_sync=(float(data["rbv_sync"]["throughput"]) if "rbv_sync" in data else None),
+        )
+
     runs: List[RunResult] = []
     total = len(rps_per_thread_list) * args.repeats
     done = 0
@@ -458,48 +577,31 @@ def main() -> int:
         if rps_pt < 0:
             raise ValueError("rps-per-thread values must be >= 0")
         for r in range(1, args.repeats + 1):
-            tag = _sanitize_tag(f"{tag_prefix}.rpspt{rps_pt}.r{r}")
+            tag = tag_prefix + _validate_tag_suffix(f".rpspt{rps_pt}.r{r}")
             out_json = results_dir / f"memcached-throughput-report.{tag}.txt.json"
             if not args.force and args.resume and out_json.exists():
+                if args.dry_run:
+                    # Only stat the file; loading it is left to the real run.
+                    print(
+                        f"[dry-run] would load existing {out_json}",
+                        file=sys.stderr,
+                    )
+                    done += 1
+                    continue
                 with open(out_json, encoding="utf8") as f:
                     data = json.load(f)
                 try:
-                    sei_tp = _extract_sei_throughputs(data)
+                    rr = _run_result_from_data(
+                        data=data, rps_pt=rps_pt, repeat=r, tag=tag, out_json=out_json
+                    )
                 except Exception:
-                    sei_tp = None
+                    rr = None
                 if (
-                    sei_tp is not None
-                    and (not args.orthrus_sync or "orthrus_sync" in data)
-                    and (not args.rbv_sync or "rbv_sync" in data)
+                    rr is not None
+                    and (not args.orthrus_sync or rr.orthrus_sync is not None)
+                    and (not args.rbv_sync or rr.rbv_sync is not None)
                 ):
-                    if args.dry_run:
-                        print(
-                            f"[dry-run] would load existing {out_json}",
-                            file=sys.stderr,
-                        )
-                    else:
-                        runs.append(
-                            RunResult(
-                                rps_per_thread=rps_pt,
-                                repeat=r,
-                                tag=tag,
-                                throughput_json=str(out_json.relative_to(root)),
-                                vanilla=float(data["vanilla"]["throughput"]),
-                                sei=sei_tp,
-                                orthrus=float(data["orthrus"]["throughput"]),
-                                orthrus_sync=(
-                                    float(data["orthrus_sync"]["throughput"])
-                                    if "orthrus_sync" in data
-                                    else None
-                                ),
-                                rbv=float(data["rbv"]["throughput"]),
-                                rbv_sync=(
-                                    float(data["rbv_sync"]["throughput"])
-                                    if "rbv_sync" in data
-                                    else None
-                                ),
-                            )
-                        )
+                    runs.append(rr)
                     done += 1
                     continue
 
@@ -569,49 +671,28 @@ def main() -> int:
             print("+", " ".join(cmd), file=sys.stderr)
             if args.dry_run:
                 continue
-            subprocess.run(cmd, cwd=str(root), check=True)
+            _run_streamed(cmd, root)
 
             if not out_json.exists():
                 raise FileNotFoundError(str(out_json))
             with open(out_json, encoding="utf8") as f:
                 data = json.load(f)
-            sei_tp = _extract_sei_throughputs(data)
             runs.append(
-                RunResult(
-                    rps_per_thread=rps_pt,
-                    repeat=r,
-                    tag=tag,
-                    throughput_json=str(out_json.relative_to(root)),
-                    vanilla=float(data["vanilla"]["throughput"]),
-                    sei=sei_tp,
-                    orthrus=float(data["orthrus"]["throughput"]),
-                    orthrus_sync=(
-                        float(data["orthrus_sync"]["throughput"])
-                        if "orthrus_sync" in data
-                        else None
-                    ),
-                    rbv=float(data["rbv"]["throughput"]),
-                    rbv_sync=(
-                        float(data["rbv_sync"]["throughput"])
-                        if "rbv_sync" in data
-                        else None
-                    ),
-                )
+                _run_result_from_data(data=data, rps_pt=rps_pt, repeat=r, tag=tag, out_json=out_json)
             )
 
     if args.dry_run:
         return 0
 
     def pick(values: Iterable[RunResult], key: str) -> List[float]:
-        out: List[float] = []
-        for rr in values:
-            out.append(getattr(rr, key))
-        return out
+        get = operator.attrgetter(key)
+        return [get(rr) for rr in values]
 
     def pick_optional(values: Iterable[RunResult], key: str) -> List[float]:
+        get = operator.attrgetter(key)
         out: List[float] = []
         for rr in values:
-            v = getattr(rr, key)
+            v = get(rr)
             if v is None:
                 continue
             out.append(v)
@@ -661,73 +742,78 @@ def main() -> int:
 
     out_json = results_dir / f"memcached-throughput-vs-rps-per-thread.{out_tag}.json"
     out_csv = results_dir / f"memcached-throughput-vs-rps-per-thread.{out_tag}.csv"
-    out_svg = results_dir / f"memcached-throughput-vs-rps-per-thread.{out_tag}.svg"
-
-    orthus_sha = _git_sha(root)
-    libsei_sha = _git_sha((root / ".." / "libsei-gcc").resolve())
-
-    out_json.write_text(
-        json.dumps(
-            {
-                "preset": args.preset,
-                "nclients": args.nclients,
-                "read_pct": args.read_pct,
-                "rps_per_thread": rps_per_thread_list,
-                "sei_variants": sei_variants,
-                "orthrus_sync": args.orthrus_sync,
-                "rbv_sync": args.rbv_sync,
-                "repeats": args.repeats,
-                "mode": args.mode,
-                "build_dir": args.build_dir,
-                "pin": args.pin,
-                "server_ip": args.server_ip,
-                "port_range": {"start": args.port_start, "end": args.port_end},
-                "client_ssh": args.client_ssh,
-                "client_workdir": args.client_workdir,
-                "remote_client_bin": args.remote_client_bin,
-                "client_temp_dir": args.client_temp_dir if args.client_ssh else None,
-                "client_pin_cpus": args.client_pin_cpus,
-                "meta": {
-                    "timestamp": timestamp,
-                    "host": platform.node(),
-                    "uname": " ".join(platform.uname()),
-                    "python": sys.version,
-                    "sha": {"Orthrus": orthus_sha, "libsei-gcc": libsei_sha},
-                },
-                "runs": [rr.__dict__ for rr in runs],
-                "series": all_series,
-            },
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf8",
+    out_svg = results_dir / (
+        f"memcached-throughput-vs-rps-per-thread.{out_tag}.{'svgz' if args.svgz else 'svg'}"
     )
 
+    orthus_sha = _git_sha(str(root))
+    libsei_sha = _git_sha(str((root / ".." / "libsei-gcc").resolve()))
+
+    summary = {
+        "preset": args.preset,
+        "nclients": args.nclients,
+        "read_pct": args.read_pct,
+        "rps_per_thread": rps_per_thread_list,
+        "sei_variants": sei_variants,
+        "orthrus_sync": args.orthrus_sync,
+        "rbv_sync": args.rbv_sync,
+        "repeats": args.repeats,
+        "mode": args.mode,
+        "build_dir": args.build_dir,
+        "pin": args.pin,
+        "server_ip": args.server_ip,
+        "port_range": {"start": args.port_start, "end": args.port_end},
+        "client_ssh": args.client_ssh,
+        "client_workdir": args.client_workdir,
+        "remote_client_bin": args.remote_client_bin,
+        "client_temp_dir": args.client_temp_dir if args.client_ssh else None,
+        "client_pin_cpus": args.client_pin_cpus,
+        "meta": {
+            "timestamp": timestamp,
+            "host": platform.node(),
+            "uname": " ".join(platform.uname()),
+            "python": sys.version,
+            "sha": {"Orthrus": orthus_sha, "libsei-gcc": libsei_sha},
+        },
+        "runs": runs,
+        "series": all_series,
+    }
+
     series_names = ["vanilla", *sei_series.keys(), "orthrus"]
     if args.orthrus_sync:
         series_names.append("orthrus_sync")
     series_names.append("rbv")
     if args.rbv_sync:
         series_names.append("rbv_sync")
-    with open(out_csv, "w", encoding="utf8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["rps_per_thread", *series_names])
+
+    def _write_json() -> None:
+        _write_json_streamed(out_json, summary, stream_key="runs")
+
+    def _write_csv() -> None:
+        columns = [all_series[name] for name in series_names]
+        rows: List[List[object]] = [["rps_per_thread", *series_names]]
         for i, rps_pt in enumerate(rps_per_thread_list):
-            row: List[object] = [rps_pt]
-            for name in series_names:
-                v = all_series.get(name, [None] * len(rps_per_thread_list))[i]
-                row.append("" if v is None else f"{v:.3f}")
-            w.writerow(row)
-
-    plot_series = {name: all_series[name] for name in series_names if name in all_series}
-    _write_svg_line_chart(
-        out_svg,
-        title=f"memcached throughput vs rps/thread (preset={args.preset}, nclients={args.nclients})",
-        x_values=rps_per_thread_list,
-        series=plot_series,
-        x_label="rps per thread (UPDATE/GET)",
-    )
+            rows.append([rps_pt, *("" if (v := col[i]) is None else f"{v:.3f}" for col in columns)])
+        with open(out_csv, "w", encoding="utf8", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+    def _write_svg() -> None:
+        plot_series = {name: all_series[name] for name in series_names if name in all_series}
+        _write_svg_line_chart(
+            out_svg,
+            title=f"memcached throughput vs rps/thread (preset={args.preset}, nclients={args.nclients})",
+            x_values=rps_per_thread_list,
+            series=plot_series,
+            x_label="rps per thread (UPDATE/GET)",
+            svgz=args.svgz,
+        )
+
+    # The three outputs are independent; write them concurrently.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(fn) for fn in (_write_json, _write_csv, _write_svg)]
+        wait(futures)
+    for fut in futures:
+        fut.result()
 
     print(f"Wrote {out_json}", file=sys.stderr)
     print(f"Wrote {out_csv}", file=sys.stderr)
@@ -1,28 +1,55 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import io
 import json
 import math
+import operator
+import os
 import platform
+import queue
+import re
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass
+from collections import defaultdict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
 from statistics import median
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # optional: only used for the median of long repeat lists
+    np = None
 
 SEI_VARIANT_CHOICES = ["er2", "er5", "er10", "dynamicNway", "core", "dynamicCore"]
 SEI_VARIANT_ALIASES = {"default": "er2"}
 
+_LIST_SPLIT = re.compile(r"\s*,\s*")
+# Non-empty, no path separators, no leading/trailing whitespace.
+_TAG_RE = re.compile(r"[^\s/\\](?:[^/\\]*[^\s/\\])?")
+
 
 def _normalize_sei_variant(variant: str) -> str:
     v = variant.strip()
     return SEI_VARIANT_ALIASES.get(v, v)
 
 
+def _split_list(s: str) -> List[str]:
+    return [p for p in _LIST_SPLIT.split(s.strip()) if p]
+
+
 def _parse_sei_variants(s: str) -> List[str]:
-    parts = [p.strip() for p in s.split(",") if p.strip()]
+    parts = _split_list(s)
     if not parts:
         raise ValueError("empty list")
     out: List[str] = []
@@ -39,30 +66,127 @@ def _parse_sei_variants(s: str) -> List[str]:
 
 
 def _parse_int_list(s: str) -> List[int]:
-    xs: List[int] = []
-    for part in s.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        xs.append(int(part))
+    xs = [int(p) for p in _split_list(s)]
     if not xs:
         raise ValueError("empty list")
     return xs
 
 
+def _parse_cpu_list(s: str) -> List[int]:
+    cpus: List[int] = []
+    for part in _split_list(s):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError("empty cpu list")
+    return sorted(set(cpus))
+
+
+def _format_cpu_list(cpus: Sequence[int]) -> str:
+    xs = sorted(set(cpus))
+    parts = []
+    start = prev = xs[0]
+    for x in xs[1:]:
+        if x == prev + 1:
+            prev = x
+            continue
+        parts.append(f"{start}-{prev}" if start != prev else f"{start}")
+        start = prev = x
+    parts.append(f"{start}-{prev}" if start != prev else f"{start}")
+    return ",".join(parts)
+
+
 def _median(values: Sequence[float]) -> float:
-    if not values:
+    n = len(values)
+    if not n:
         raise ValueError("median of empty list")
+    # The common --repeats 1..3 case needs no general-purpose selection.
+    if n <= 3:
+        xs = sorted(values)
+        return float(xs[1] if n == 3 else (xs[0] + xs[-1]) / 2)
+    if np is not None:
+        return float(np.median(np.fromiter(values, dtype=np.float64, count=n)))
     return float(median(values))
 
 
-def _git_sha(repo: Path) -> str:
+def _load_json(path: Path) -> dict:
+    raw = path.read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals that json.dump writes
+            # (e.g. in run-compare sidecars); let the stdlib decide.
+            pass
+    return json.loads(raw)
+
+
+def _dumps_json(obj: object) -> bytes:
+    # With orjson the layout (2-space indent, ": " separators, raw UTF-8 like
+    # ensure_ascii=False) matches the stdlib fallback, but floats that need an
+    # exponent are spelled without "+"/zero padding (1e16, 1e-5 instead of
+    # 1e+16, 1e-05) and NaN/Infinity are written as null.
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf8")
+
+
+def _run_emitting_json(
+    cmd: Sequence[str], cwd: Path, *, label: Optional[str] = None
+) -> Optional[dict]:
+    # Forward the child's stdout to our stderr as it arrives, holding back one
+    # line: run-compare --emit-stdout prints the throughput JSON last. That
+    # line is consumed only if it parses as a JSON object; otherwise (and on
+    # failure) it is forwarded like the rest. With a label (concurrent cells),
+    # the child's stderr is merged in and every forwarded line is prefixed so
+    # that interleaved output stays attributable.
+    prefix = f"[{label}] " if label is not None else ""
+    last: Optional[str] = None
+    with subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if label is not None else None,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if last is not None:
+                sys.stderr.write(prefix + last)
+            last = line
+        rc = proc.wait()
+
+    data = None
+    if last is not None and rc == 0:
+        try:
+            parsed = json.loads(last)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            data = parsed
+            last = None
+    if last is not None:
+        sys.stderr.write(prefix + last)
+    if rc:
+        raise subprocess.CalledProcessError(rc, list(cmd))
+    return data
+
+
+@lru_cache(maxsize=None)
+def _git_sha(repo: str) -> str:
     try:
         res = subprocess.run(
-            ["git", "-C", str(repo), "rev-parse", "HEAD"],
+            ["git", "-C", repo, "rev-parse", "HEAD"],
             check=True,
             capture_output=True,
             text=True,
+            env={**os.environ, "GIT_OPTIONAL_LOCKS": "0"},
         )
         return res.stdout.strip()
     except Exception:
@@ -70,13 +194,13 @@ def _git_sha(repo: Path) -> str:
 
 
 def _sanitize_tag(tag: str) -> str:
+    if _TAG_RE.fullmatch(tag):
+        return tag
     if "/" in tag or "\\" in tag:
         raise ValueError("tag must not contain path separators")
-    if tag.strip() != tag:
-        raise ValueError("tag must not have leading/trailing whitespace")
     if not tag:
         raise ValueError("tag must be non-empty")
-    return tag
+    raise ValueError("tag must not have leading/trailing whitespace")
 
 
 def _format_si(n: float) -> str:
@@ -105,14 +229,22 @@ def _nice_step(span: float, ticks: int) -> float:
     return nice * base
 
 
+_SVG_STYLE = (
+    "<style>"
+    "text{font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;fill:#111;}"
+    ".grid{stroke:#e5e7eb;stroke-width:1;}"
+    ".axis{stroke:#111;stroke-width:1.2;}"
+    ".tick{stroke:#111;stroke-width:1;}"
+    "</style>\n"
+)
+
+_SVG_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}
+)
+
+
 def _svg_escape(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
-    )
+    return text.translate(_SVG_ESCAPES)
 
 
 def _write_svg_line_chart(
@@ -166,102 +298,101 @@ def _write_svg_line_chart(
         "#17becf",
     ]
     names = list(series.keys())
-    colors = {name: palette[i % len(palette)] for i, name in enumerate(names)}
+    series_color = [palette[i % len(palette)] for i in range(len(names))]
 
     y_ticks = 6
     step = _nice_step(y_max - y_min, y_ticks)
     y_tick0 = 0.0
     y_tick_last = math.ceil(y_max / step) * step
 
-    lines: List[str] = []
-    lines.append(
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
-    )
-    lines.append(
-        '<style>'
-        'text{font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;fill:#111;}'
-        '.grid{stroke:#e5e7eb;stroke-width:1;}'
-        '.axis{stroke:#111;stroke-width:1.2;}'
-        '.tick{stroke:#111;stroke-width:1;}'
-        '</style>'
+    buf = io.StringIO()
+    buf.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">\n'
     )
+    buf.write(_SVG_STYLE)
 
-    lines.append(
+    buf.write(
         f'<text x="{width/2:.1f}" y="{margin_top/2:.1f}" text-anchor="middle" '
-        f'font-size="20">{_svg_escape(title)}</text>'
+        f'font-size="20">{_svg_escape(title)}</text>\n'
     )
 
     x_axis_y = plot_y0 + plot_h
-    lines.append(
-        f'<line class="axis" x1="{plot_x0}" y1="{x_axis_y}" x2="{plot_x0+plot_w}" y2="{x_axis_y}"/>'
+    buf.write(
+        f'<line class="axis" x1="{plot_x0}" y1="{x_axis_y}" x2="{plot_x0+plot_w}" y2="{x_axis_y}"/>\n'
     )
-    lines.append(
-        f'<line class="axis" x1="{plot_x0}" y1="{plot_y0}" x2="{plot_x0}" y2="{plot_y0+plot_h}"/>'
+    buf.write(
+        f'<line class="axis" x1="{plot_x0}" y1="{plot_y0}" x2="{plot_x0}" y2="{plot_y0+plot_h}"/>\n'
     )
 
-    y = y_tick0
-    while y <= y_tick_last + 1e-9:
+    n_ticks = int(round((y_tick_last - y_tick0) / step))
+    for k in range(n_ticks + 1):
+        y = y_tick0 + k * step
         yp = y_pos(y)
-        lines.append(
-            f'<line class="grid" x1="{plot_x0}" y1="{yp:.1f}" x2="{plot_x0+plot_w}" y2="{yp:.1f}"/>'
+        if round(yp, 1) == 0.0:
+            # The top tick can sit a rounding error above the plot edge; keep
+            # it from printing as "-0.0".
+            yp = 0.0
+        buf.write(
+            f'<line class="grid" x1="{plot_x0}" y1="{yp:.1f}" x2="{plot_x0+plot_w}" y2="{yp:.1f}"/>\n'
         )
-        lines.append(
-            f'<line class="tick" x1="{plot_x0-6}" y1="{yp:.1f}" x2="{plot_x0}" y2="{yp:.1f}"/>'
+        buf.write(
+            f'<line class="tick" x1="{plot_x0-6}" y1="{yp:.1f}" x2="{plot_x0}" y2="{yp:.1f}"/>\n'
         )
-        lines.append(
-            f'<text x="{plot_x0-10}" y="{yp+4:.1f}" text-anchor="end" font-size="12">{_svg_escape(_format_si(y))}</text>'
+        buf.write(
+            f'<text x="{plot_x0-10}" y="{yp+4:.1f}" text-anchor="end" font-size="12">{_svg_escape(_format_si(y))}</text>\n'
         )
-        y += step
 
-    for i, x in enumerate(x_values):
-        xp = x_pos(i)
-        lines.append(
-            f'<line class="tick" x1="{xp:.1f}" y1="{x_axis_y}" x2="{xp:.1f}" y2="{x_axis_y+6}"/>'
+    x_pos_list = [x_pos(i) for i in range(len(x_values))]
+
+    for x, xp in zip(x_values, x_pos_list):
+        buf.write(
+            f'<line class="tick" x1="{xp:.1f}" y1="{x_axis_y}" x2="{xp:.1f}" y2="{x_axis_y+6}"/>\n'
         )
-        lines.append(
-            f'<text x="{xp:.1f}" y="{x_axis_y+24}" text-anchor="middle" font-size="12">{x}</text>'
+        buf.write(
+            f'<text x="{xp:.1f}" y="{x_axis_y+24}" text-anchor="middle" font-size="12">{x}</text>\n'
         )
 
-    lines.append(
-        f'<text x="{plot_x0+plot_w/2:.1f}" y="{height-30}" text-anchor="middle" font-size="14">{_svg_escape(x_label)}</text>'
+    buf.write(
+        f'<text x="{plot_x0+plot_w/2:.1f}" y="{height-30}" text-anchor="middle" font-size="14">{_svg_escape(x_label)}</text>\n'
     )
-    lines.append(
+    buf.write(
         f'<text x="20" y="{plot_y0+plot_h/2:.1f}" text-anchor="middle" font-size="14" transform="rotate(-90 20 {plot_y0+plot_h/2:.1f})">'
-        f"{_svg_escape(y_label)}</text>"
+        f"{_svg_escape(y_label)}</text>\n"
     )
 
-    for name, ys in series.items():
+    for si, ys in enumerate(series.values()):
+        color = series_color[si]
         pts: List[Tuple[float, float]] = []
         for i, yv in enumerate(ys):
             if yv is None:
                 continue
-            pts.append((x_pos(i), y_pos(yv)))
+            pts.append((x_pos_list[i], y_pos(yv)))
         if len(pts) >= 2:
             poly = " ".join(f"{x:.1f},{y:.1f}" for x, y in pts)
-            lines.append(
-                f'<polyline fill="none" stroke="{colors[name]}" stroke-width="2.4" points="{poly}"/>'
+            buf.write(
+                f'<polyline fill="none" stroke="{color}" stroke-width="2.4" points="{poly}"/>\n'
             )
         for x, y in pts:
-            lines.append(
-                f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4.0" fill="{colors[name]}" stroke="#fff" stroke-width="1"/>'
+            buf.write(
+                f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4.0" fill="{color}" stroke="#fff" stroke-width="1"/>\n'
             )
 
     legend_x0 = plot_x0 + plot_w + 20
     legend_y0 = plot_y0 + 10
-    lines.append(
-        f'<text x="{legend_x0}" y="{legend_y0-8}" font-size="14" font-weight="600">series</text>'
+    buf.write(
+        f'<text x="{legend_x0}" y="{legend_y0-8}" font-size="14" font-weight="600">series</text>\n'
     )
     for i, name in enumerate(names):
         y = legend_y0 + i * 22
-        lines.append(
-            f'<rect x="{legend_x0}" y="{y-10}" width="14" height="14" fill="{colors[name]}"/>'
+        buf.write(
+            f'<rect x="{legend_x0}" y="{y-10}" width="14" height="14" fill="{series_color[i]}"/>\n'
         )
-        lines.append(
-            f'<text x="{legend_x0+20}" y="{y+2}" font-size="12">{_svg_escape(name)}</text>'
+        buf.write(
+            f'<text x="{legend_x0+20}" y="{y+2}" font-size="12">{_svg_escape(name)}</text>\n'
         )
 
-    lines.append("</svg>")
-    out.write_text("\n".join(lines) + "\n", encoding="utf8")
+    buf.write("</svg>\n")
+    out.write_bytes(buf.getvalue().encode("utf8"))
 
 
 @dataclass(frozen=True)
@@ -278,6 +409,14 @@ class RunResult:
     rbv_sync: Optional[float]
 
 
+_RUN_FIELDS = tuple(f.name for f in fields(RunResult))
+_get_run_fields = operator.attrgetter(*_RUN_FIELDS)
+
+
+def _run_to_dict(rr: RunResult) -> Dict[str, object]:
+    return dict(zip(_RUN_FIELDS, _get_run_fields(rr)))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Run memcached sweep over --rps (rate limiting for UPDATE/GET) and generate a throughput plot."
@@ -373,12 +512,55 @@ def main() -> int:
         action="store_true",
         help="Print commands without executing.",
     )
+    parser.add_argument(
+        "--driver-cpus",
+        default=None,
+        help=(
+            "CPU list (example: 47 or 46-47) to pin this driver process to, so that its "
+            "orchestration does not compete with the benchmark. run-compare is then started "
+            "(via taskset) on the remaining CPUs of the original affinity. Linux only."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of run-compare invocations to run concurrently (default: 1). "
+            "The port range is split into --jobs disjoint windows, one per concurrent run. "
+            "Values above 1 require --no-pin and --mode throughput."
+        ),
+    )
     args = parser.parse_args()
 
     if args.nclients <= 0:
         raise ValueError("--nclients must be >= 1")
     if args.repeats <= 0:
         raise ValueError("--repeats must be >= 1")
+    if args.jobs <= 0:
+        raise ValueError("--jobs must be >= 1")
+    if args.jobs > 1:
+        # Concurrent run-compare processes only get disjoint ports. Each one
+        # derives its CPU layout from the same affinity, and memory runs write
+        # fixed-name status logs under the repo root, so both would collide.
+        if args.pin or args.client_pin_cpus is not None:
+            raise ValueError("--jobs > 1 requires --no-pin (and no --client-pin-cpus)")
+        if args.mode != "throughput":
+            raise ValueError("--jobs > 1 requires --mode throughput")
+
+    child_prefix: List[str] = []
+    if args.driver_cpus is not None and hasattr(os, "sched_setaffinity"):
+        driver_cpus = set(_parse_cpu_list(args.driver_cpus))
+        orig_cpus = set(os.sched_getaffinity(0))
+        if not driver_cpus <= orig_cpus:
+            raise ValueError("--driver-cpus must be a subset of the current CPU affinity")
+        child_cpus = orig_cpus - driver_cpus
+        if not child_cpus:
+            raise ValueError("--driver-cpus must leave CPUs for run-compare")
+        # run-compare derives its CPU layout from its own affinity, which it
+        # would otherwise inherit from the pinned driver.
+        child_prefix = ["taskset", "-c", _format_cpu_list(sorted(child_cpus))]
+        os.sched_setaffinity(0, driver_cpus)
 
     if args.mode == "memory":
         raise ValueError(
@@ -464,8 +646,7 @@ def main() -> int:
 
     def _try_load_existing(*, out_json: Path, rps: int, repeat: int, tag: str) -> Optional[RunResult]:
         try:
-            with open(out_json, encoding="utf8") as f:
-                data = json.load(f)
+            data = _load_json(out_json)
             rr = _run_result_from_data(data=data, rps=rps, repeat=repeat, tag=tag, out_json=out_json)
         except Exception:
             return None
@@ -475,158 +656,239 @@ def main() -> int:
             return None
         return rr
 
+    port_windows: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+    if args.jobs > 1:
+        port_window = (args.port_end - args.port_start + 1) // args.jobs
+        if port_window < 2:
+            raise ValueError("--port-start/--port-end range too small for --jobs")
+        for k in range(args.jobs):
+            lo = args.port_start + k * port_window
+            port_windows.put((lo, lo + port_window - 1))
+    else:
+        port_windows.put((args.port_start, args.port_end))
+
+    # Everything that does not depend on the cell; per-cell arguments are
+    # appended to a copy in _build_cmd.
+    base_cmd: List[str] = [
+        *child_prefix,
+        sys.executable,
+        str(run_compare),
+        "--build-dir",
+        str(args.build_dir),
+        "--preset",
+        args.preset,
+        "--server-ip",
+        args.server_ip,
+        "--sei-variants",
+        ",".join(sei_variants),
+        "--nclients",
+        str(args.nclients),
+        "--mode",
+        args.mode,
+        "--emit-stdout",
+        "--orthrus-sync" if args.orthrus_sync else "--no-orthrus-sync",
+        "--rbv-sync" if args.rbv_sync else "--no-rbv-sync",
+    ]
+    if not args.pin:
+        base_cmd.append("--no-pin")
+    if args.ngroups is not None:
+        base_cmd += ["--ngroups", str(args.ngroups)]
+    if args.vanilla_ngroups is not None:
+        base_cmd += ["--vanilla-ngroups", str(args.vanilla_ngroups)]
+    if args.sei_ngroups is not None:
+        base_cmd += ["--sei-ngroups", str(args.sei_ngroups)]
+    if args.orthrus_ngroups is not None:
+        base_cmd += ["--orthrus-ngroups", str(args.orthrus_ngroups)]
+    if args.rbv_ngroups is not None:
+        base_cmd += ["--rbv-ngroups", str(args.rbv_ngroups)]
+    if args.nsets_exp is not None:
+        base_cmd += ["--nsets-exp", str(args.nsets_exp)]
+    if args.ngets_exp is not None:
+        base_cmd += ["--ngets-exp", str(args.ngets_exp)]
+    if args.read_pct is not None:
+        base_cmd += ["--read-pct", str(args.read_pct)]
+    if args.timeout_sec is not None:
+        base_cmd += ["--timeout-sec", str(args.timeout_sec)]
+    if args.client_ssh is not None:
+        base_cmd += ["--client-ssh", args.client_ssh]
+        if args.client_workdir is not None:
+            base_cmd += ["--client-workdir", args.client_workdir]
+        if args.remote_client_bin is not None:
+            base_cmd += ["--remote-client-bin", args.remote_client_bin]
+        if args.client_temp_dir is not None:
+            base_cmd += ["--client-temp-dir", args.client_temp_dir]
+        if args.client_pin_cpus is not None:
+            base_cmd += ["--client-pin-cpus", args.client_pin_cpus]
+
+    def _build_cmd(*, rps: int, tag: str, port_start: int, port_end: int) -> List[str]:
+        cmd = base_cmd.copy()
+        cmd += [
+            "--port-start",
+            str(port_start),
+            "--port-end",
+            str(port_end),
+            "--rps",
+            str(rps),
+            "--tag",
+            tag,
+        ]
+        return cmd
+
     runs: List[RunResult] = []
     total = len(rps_list) * args.repeats
     done = 0
+    progress_lock = threading.Lock()
+    # Set by the first failing cell so that workers do not start queued cells.
+    failed = threading.Event()
+
+    def _execute_one(rps: int, r: int, tag: str, out_json: Path) -> RunResult:
+        if failed.is_set():
+            raise CancelledError()
+        try:
+            return _execute_cell(rps, r, tag, out_json)
+        except BaseException:
+            failed.set()
+            raise
+
+    def _execute_cell(rps: int, r: int, tag: str, out_json: Path) -> RunResult:
+        nonlocal done
+        port_start, port_end = port_windows.get()
+        try:
+            cmd = _build_cmd(rps=rps, tag=tag, port_start=port_start, port_end=port_end)
+            with progress_lock:
+                done += 1
+                print(
+                    f"[{done}/{total}] rps={rps} nclients={args.nclients} "
+                    f"sei_variants={','.join(sei_variants)} r={r}",
+                    file=sys.stderr,
+                )
+                print("+", " ".join(cmd), file=sys.stderr)
+            data = _run_emitting_json(cmd, root, label=tag if args.jobs > 1 else None)
+        finally:
+            port_windows.put((port_start, port_end))
+
+        if not out_json.exists():
+            raise FileNotFoundError(str(out_json))
+        # The sidecar file remains the fallback (and is what --resume reads).
+        if data is None:
+            data = _load_json(out_json)
+        return _run_result_from_data(data=data, rps=rps, repeat=r, tag=tag, out_json=out_json)
+
+    # A dry run only plans: it never parses existing outputs, aggregates, or
+    # spawns git.
+    plan_only = args.dry_run
+
+    cells: List[Tuple[int, int, str, Path]] = []
     for rps in rps_list:
         for r in range(1, args.repeats + 1):
             tag = _sanitize_tag(f"{tag_prefix}.rps{rps}.r{r}")
             out_json = results_dir / f"memcached-throughput-report.{tag}.txt.json"
+            cells.append((rps, r, tag, out_json))
+
+    resumable = (
+        {i for i, cell in enumerate(cells) if cell[3].exists()}
+        if not args.force and args.resume
+        else set()
+    )
 
-            if not args.force and args.resume and out_json.exists():
-                rr = _try_load_existing(out_json=out_json, rps=rps, repeat=r, tag=tag)
-                if rr is not None:
-                    if args.dry_run:
-                        print(
-                            f"[dry-run] would load existing {out_json}",
-                            file=sys.stderr,
-                        )
-                    else:
-                        runs.append(rr)
-                    done += 1
-                    continue
-
-            cmd: List[str] = [
-                sys.executable,
-                str(run_compare),
-                "--build-dir",
-                str(args.build_dir),
-                "--preset",
-                args.preset,
-                "--server-ip",
-                args.server_ip,
-                "--port-start",
-                str(args.port_start),
-                "--port-end",
-                str(args.port_end),
-                "--sei-variants",
-                ",".join(sei_variants),
-                "--nclients",
-                str(args.nclients),
-                "--rps",
-                str(rps),
-                "--mode",
-                args.mode,
-                "--tag",
-                tag,
-                "--orthrus-sync" if args.orthrus_sync else "--no-orthrus-sync",
-                "--rbv-sync" if args.rbv_sync else "--no-rbv-sync",
-            ]
-            if not args.pin:
-                cmd.append("--no-pin")
-            if args.ngroups is not None:
-                cmd += ["--ngroups", str(args.ngroups)]
-            if args.vanilla_ngroups is not None:
-                cmd += ["--vanilla-ngroups", str(args.vanilla_ngroups)]
-            if args.sei_ngroups is not None:
-                cmd += ["--sei-ngroups", str(args.sei_ngroups)]
-            if args.orthrus_ngroups is not None:
-                cmd += ["--orthrus-ngroups", str(args.orthrus_ngroups)]
-            if args.rbv_ngroups is not None:
-                cmd += ["--rbv-ngroups", str(args.rbv_ngroups)]
-            if args.nsets_exp is not None:
-                cmd += ["--nsets-exp", str(args.nsets_exp)]
-            if args.ngets_exp is not None:
-                cmd += ["--ngets-exp", str(args.ngets_exp)]
-            if args.read_pct is not None:
-                cmd += ["--read-pct", str(args.read_pct)]
-            if args.timeout_sec is not None:
-                cmd += ["--timeout-sec", str(args.timeout_sec)]
-            if args.client_ssh is not None:
-                cmd += ["--client-ssh", args.client_ssh]
-                if args.client_workdir is not None:
-                    cmd += ["--client-workdir", args.client_workdir]
-                if args.remote_client_bin is not None:
-                    cmd += ["--remote-client-bin", args.remote_client_bin]
-                if args.client_temp_dir is not None:
-                    cmd += ["--client-temp-dir", args.client_temp_dir]
-                if args.client_pin_cpus is not None:
-                    cmd += ["--client-pin-cpus", args.client_pin_cpus]
+    # Parse the existing outputs concurrently so that the per-file read latency
+    # overlaps (this matters for large sweeps on networked storage).
+    loaded: Dict[int, Optional[RunResult]] = {}
+    if resumable and not plan_only:
+        idxs = sorted(resumable)
+        with ThreadPoolExecutor(max_workers=min(32, len(idxs))) as pool:
+            results = pool.map(
+                lambda i: _try_load_existing(
+                    out_json=cells[i][3], rps=cells[i][0], repeat=cells[i][1], tag=cells[i][2]
+                ),
+                idxs,
+            )
+            loaded = dict(zip(idxs, results))
+
+    pending: List[Tuple[int, int, str, Path]] = []
+    for i, (rps, r, tag, out_json) in enumerate(cells):
+        if i in resumable:
+            if plan_only:
+                print(
+                    f"[dry-run] would load existing {out_json}",
+                    file=sys.stderr,
+                )
+                done += 1
+                continue
+            rr = loaded[i]
+            if rr is not None:
+                runs.append(rr)
+                done += 1
+                continue
 
+        if plan_only:
             done += 1
             print(
                 f"[{done}/{total}] rps={rps} nclients={args.nclients} "
                 f"sei_variants={','.join(sei_variants)} r={r}",
                 file=sys.stderr,
             )
+            cmd = _build_cmd(rps=rps, tag=tag, port_start=args.port_start, port_end=args.port_end)
             print("+", " ".join(cmd), file=sys.stderr)
-            if args.dry_run:
-                continue
-            subprocess.run(cmd, cwd=str(root), check=True)
-
-            if not out_json.exists():
-                raise FileNotFoundError(str(out_json))
-            with open(out_json, encoding="utf8") as f:
-                data = json.load(f)
-            runs.append(_run_result_from_data(data=data, rps=rps, repeat=r, tag=tag, out_json=out_json))
-
-    if args.dry_run:
+            continue
+        pending.append((rps, r, tag, out_json))
+
+    if pending:
+        if args.jobs == 1:
+            for job in pending:
+                runs.append(_execute_one(*job))
+        else:
+            with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+                futures = [pool.submit(_execute_one, *job) for job in pending]
+                try:
+                    for fut in as_completed(futures):
+                        runs.append(fut.result())
+                except BaseException:
+                    # Stop at the first failure like the serial loop: drop the
+                    # queued cells and only wait for the ones already running.
+                    for fut in futures:
+                        fut.cancel()
+                    raise
+        # Keep the aggregated "runs" list in sweep order (resumed and fresh runs
+        # are collected separately, and parallel runs finish out of order).
+        rps_index = {rps: i for i, rps in enumerate(rps_list)}
+        runs.sort(key=lambda rr: (rps_index[rr.rps], rr.repeat))
+
+    if plan_only:
         return 0
 
-    def pick(values: Iterable[RunResult], key: str) -> List[float]:
-        out: List[float] = []
-        for rr in values:
-            out.append(getattr(rr, key))
-        return out
-
-    def pick_optional(values: Iterable[RunResult], key: str) -> List[float]:
-        out: List[float] = []
-        for rr in values:
-            v = getattr(rr, key)
-            if v is None:
-                continue
-            out.append(v)
-        return out
+    n_rps = len(rps_list)
+    base_names = ["vanilla", "orthrus"]
+    if args.orthrus_sync:
+        base_names.append("orthrus_sync")
+    base_names.append("rbv")
+    if args.rbv_sync:
+        base_names.append("rbv_sync")
 
-    by_rps: Dict[int, List[RunResult]] = {}
+    # Group every per-run value by (rps, series name) in a single pass over the
+    # runs, then reduce each group to its median.
+    table: Dict[Tuple[int, str], List[float]] = defaultdict(list)
     for rr in runs:
-        by_rps.setdefault(rr.rps, []).append(rr)
-
-    base_series: Dict[str, List[Optional[float]]] = {
-        "vanilla": [],
-        "orthrus": [],
-        **({"orthrus_sync": []} if args.orthrus_sync else {}),
-        "rbv": [],
-        **({"rbv_sync": []} if args.rbv_sync else {}),
+        for name in base_names:
+            v = getattr(rr, name)
+            if v is not None:
+                table[(rr.rps, name)].append(v)
+        for variant, tp in rr.sei.items():
+            table[(rr.rps, sei_series_name[variant])].append(tp)
+
+    def _median_series(name: str) -> List[Optional[float]]:
+        ys: List[Optional[float]] = [None] * n_rps
+        for i, rps in enumerate(rps_list):
+            vals = table.get((rps, name))
+            if vals:
+                ys[i] = _median(vals)
+        return ys
+
+    base_series = {name: _median_series(name) for name in base_names}
+    sei_series = {
+        sei_series_name[variant]: _median_series(sei_series_name[variant])
+        for variant in sei_variants
     }
-    for rps in rps_list:
-        vals = by_rps.get(rps, [])
-        if not vals:
-            for k in base_series:
-                base_series[k].append(None)
-            continue
-        base_series["vanilla"].append(_median(pick(vals, "vanilla")))
-        base_series["orthrus"].append(_median(pick(vals, "orthrus")))
-        if args.orthrus_sync:
-            sync_vals = pick_optional(vals, "orthrus_sync")
-            base_series["orthrus_sync"].append(_median(sync_vals) if sync_vals else None)
-        base_series["rbv"].append(_median(pick(vals, "rbv")))
-        if args.rbv_sync:
-            rbv_sync_vals = pick_optional(vals, "rbv_sync")
-            base_series["rbv_sync"].append(_median(rbv_sync_vals) if rbv_sync_vals else None)
-
-    sei_series: Dict[str, List[Optional[float]]] = {}
-    for variant in sei_variants:
-        name = sei_series_name[variant]
-        ys: List[Optional[float]] = []
-        for rps in rps_list:
-            vals = [
-                rr.sei[variant]
-                for rr in by_rps.get(rps, [])
-                if isinstance(rr.sei, dict) and variant in rr.sei
-            ]
-            ys.append(_median(vals) if vals else None)
-        sei_series[name] = ys
 
     all_series: Dict[str, List[Optional[float]]] = {**base_series, **sei_series}
 
@@ -634,11 +896,11 @@ def main() -> int:
     out_csv = results_dir / f"memcached-throughput-vs-rps.{out_tag}.csv"
     out_svg = results_dir / f"memcached-throughput-vs-rps.{out_tag}.svg"
 
-    orthrus_sha = _git_sha(root)
-    libsei_sha = _git_sha((root / ".." / "libsei-gcc").resolve())
+    orthrus_sha = _git_sha(str(root.resolve()))
+    libsei_sha = _git_sha(str((root / ".." / "libsei-gcc").resolve()))
 
-    out_json.write_text(
-        json.dumps(
+    out_json.write_bytes(
+        _dumps_json(
             {
                 "preset": args.preset,
                 "nclients": args.nclients,
@@ -669,14 +931,10 @@ def main() -> int:
                     "rps_semantics": "rps is passed to the client and applies to UPDATE/GET only; internally the client computes rps_per_thread=rps*ngroups/nclients",
                     "rps_0": "rps=0 means no rate limiting (max load).",
                 },
-                "runs": [rr.__dict__ for rr in runs],
+                "runs": [_run_to_dict(rr) for rr in runs],
                 "series": all_series,
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
-        + "\n",
-        encoding="utf8",
     )
 
     series_names = ["vanilla", *sei_series.keys(), "orthrus"]
@@ -685,15 +943,15 @@ def main() -> int:
     series_names.append("rbv")
     if args.rbv_sync:
         series_names.append("rbv_sync")
+    columns = [all_series[name] for name in series_names]
+    csv_rows: List[List[object]] = [
+        [rps, *("" if (v := col[i]) is None else f"{v:.3f}" for col in columns)]
+        for i, rps in enumerate(rps_list)
+    ]
     with open(out_csv, "w", encoding="utf8", newline="") as f:
         w = csv.writer(f)
         w.writerow(["rps", *series_names])
-        for i, rps in enumerate(rps_list):
-            row: List[object] = [rps]
-            for name in series_names:
-                v = all_series.get(name, [None] * len(rps_list))[i]
-                row.append("" if v is None else f"{v:.3f}")
-            w.writerow(row)
+        w.writerows(csv_rows)
 
     plot_series = {name: all_series[name] for name in series_names if name in all_series}
     _write_svg_line_chart(